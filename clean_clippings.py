@@ -10,14 +10,23 @@ Examples:
 from __future__ import print_function
 import re
 import sys
-import hashlib
 import difflib
+import functools
+import mmap
+import os
 from collections import defaultdict
-from typing import List, Tuple, Optional, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Tuple, Optional, Dict, Any, Iterator
 import time
 
 BOM = "\ufeff"
+ENTRY_SEP = "=========="
 CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+# str.translate table deleting the CJK_RE range, used to count CJK chars without a match list
+REMOVE_CJK_TABLE = dict.fromkeys(range(0x4e00, 0x9fff + 1))
+WS_RE = re.compile(r"\s+")
+TRAIL_PUNCT_RE = re.compile(r"[。！？…\.\!\?]+$")
 
 LOC_PATTERNS = [
     re.compile(r"位置\s*#?(\d+)(?:-(\d+))?"),
@@ -35,6 +44,17 @@ TS_PATTERNS = [
     re.compile(r"添加于\s+(.+)")
 ]
 
+# Chinese pattern: 2025年9月18日 星期四 上午11:20:48 or without weekday
+TS_CN_RE = re.compile(r'(\d{4})年\s*(\d{1,2})月\s*(\d{1,2})日.*?(上午|下午)?\s*(\d{1,2}):(\d{2}):(\d{2})')
+# ISO-ish or numeric: 2025-09-18 11:20:48 or 2025/09/18 11:20:48
+TS_ISO_RE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})[ T](\d{1,2}):(\d{2}):(\d{2})')
+
+# strictest min_len is_duplicate uses for is_subset; longer contained norms are always duplicates
+SUBSET_MIN_LEN = 16
+
+# ProcessPoolExecutor refuses more than 61 workers on Windows
+MAX_WORKERS = 61 if sys.platform == "win32" else None
+
 # sentence/ clause split (Chinese and common punctuation)
 CLAUSE_SPLIT_RE = re.compile(r'[。！？；;.!?\n]+')
 
@@ -44,22 +64,19 @@ def strip_bom(s: str) -> str:
 def mostly_cjk(text: str, threshold: float = 0.3) -> bool:
     if not text:
         return False
-    cjk = len(CJK_RE.findall(text))
+    cjk = len(text) - len(text.translate(REMOVE_CJK_TABLE))
     return (cjk / max(1, len(text))) >= threshold
 
 def normalize_for_compare(text: str) -> str:
     if not text:
         return ""
-    t = text.replace("\r\n", "\n").replace("\r", "\n").strip()
-    t = re.sub(r"\s+", " ", t)
+    # "\r" is whitespace to both strip() and WS_RE, so no newline conversion is needed
+    t = WS_RE.sub(" ", text.strip())
     if mostly_cjk(t):
-        t = re.sub(r"\s+", "", t)  # remove spaces for CJK
-    t = re.sub(r"[。！？…\.\!\?]+$", "", t)
+        t = t.replace(" ", "")  # remove spaces for CJK (only single spaces are left)
+    t = TRAIL_PUNCT_RE.sub("", t)
     return t
 
-def md5_utf8(text: str) -> str:
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
-
 def parse_loc(meta: str) -> Tuple[Optional[int], Optional[int]]:
     for pat in LOC_PATTERNS:
         m = pat.search(meta)
@@ -91,6 +108,21 @@ def parse_timestamp(meta: str) -> Optional[str]:
             return m.group(1).strip()
     return None
 
+@functools.lru_cache(maxsize=1024)
+def _hour_epoch(year: int, month: int, day: int, hour: int) -> int:
+    return int(time.mktime((year, month, day, hour, 0, 0, 0, 0, -1)))
+
+def local_epoch(year: int, month: int, day: int, hh: int, mm: int, ss: int) -> int:
+    """Epoch seconds of a naive local time.
+    mktime is only called once per distinct hour (clippings cluster around
+    reading sessions). Hours that are not exactly 3600 s long, i.e. contain a
+    DST shift off the hour (Lord Howe, Chatham), go to mktime directly.
+    """
+    base = _hour_epoch(year, month, day, hh)
+    if _hour_epoch(year, month, day, hh + 1) - base != 3600:
+        return int(time.mktime((year, month, day, hh, mm, ss, 0, 0, -1)))
+    return base + mm * 60 + ss
+
 def parse_timestamp_to_epoch(ts: Optional[str]) -> Optional[int]:
     """Try to parse timestamp strings to epoch seconds (naive, local time).
     Supports Chinese 'YYYY年M月D日 上午/下午 HH:MM:SS' and ISO-like numeric dates.
@@ -99,8 +131,7 @@ def parse_timestamp_to_epoch(ts: Optional[str]) -> Optional[int]:
     if not ts:
         return None
     ts = ts.strip()
-    # Chinese pattern: 2025年9月18日 星期四 上午11:20:48 or without weekday
-    m = re.search(r'(\d{4})年\s*(\d{1,2})月\s*(\d{1,2})日.*?(上午|下午)?\s*(\d{1,2}):(\d{2}):(\d{2})', ts)
+    m = TS_CN_RE.search(ts)
     if m:
         year = int(m.group(1)); month = int(m.group(2)); day = int(m.group(3))
         ampm = m.group(4)
@@ -111,25 +142,46 @@ def parse_timestamp_to_epoch(ts: Optional[str]) -> Optional[int]:
             if ampm == '上午' and hh == 12:
                 hh = 0
         try:
-            struct = time.struct_time((year, month, day, hh, mm, ss, 0, 0, -1))
-            return int(time.mktime(struct))
+            return local_epoch(year, month, day, hh, mm, ss)
         except Exception:
             return None
-    # ISO-ish or numeric: 2025-09-18 11:20:48 or 2025/09/18 11:20:48
-    m2 = re.search(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})[ T](\d{1,2}):(\d{2}):(\d{2})', ts)
+    m2 = TS_ISO_RE.search(ts)
     if m2:
         y,mn,d,h,mi,s = map(int, m2.groups())
         try:
-            struct = time.struct_time((y,mn,d,h,mi,s,0,0,-1))
-            return int(time.mktime(struct))
+            return local_epoch(y, mn, d, h, mi, s)
         except Exception:
             return None
     # fallback: extract first occurrence of HH:MM:SS and today's date -> not reliable
     return None
 
-def split_entries(content: str) -> List[str]:
-    parts = content.split("==========")
-    return [p.strip() for p in parts if p.strip()]
+def iter_entries(path: str) -> Iterator[str]:
+    """Yield the stripped, non-empty entry blocks of a clippings file without
+    reading the whole file into one string. The file is memory-mapped and
+    scanned for the separator; each block is decoded on its own with newlines
+    translated as text mode would. For valid UTF-8 this gives the same blocks
+    as splitting the decoded text; with invalid bytes inside a separator the
+    byte scan does not split there, while errors="ignore" on the whole text
+    would.
+    """
+    sep = ENTRY_SEP.encode("ascii")
+    with open(path, "rb") as fp:
+        try:
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return
+        with mm:
+            start = 0
+            while start <= len(mm):
+                end = mm.find(sep, start)
+                if end < 0:
+                    end = len(mm)
+                block = mm[start:end].decode("utf-8", errors="ignore")
+                block = block.replace("\r\n", "\n").replace("\r", "\n").strip()
+                if block:
+                    yield block
+                start = end + len(sep)
 
 def split_clauses(text: str) -> List[str]:
     if not text:
@@ -141,7 +193,9 @@ def parse_entry(block: str, idx: int) -> Optional[Dict[str, Any]]:
     lines = [l.rstrip("\n") for l in block.split("\n")]
     if len(lines) < 2:
         return None
-    title = strip_bom(lines[0])
+    # the same title repeats on every clipping of a book; intern it so grouping
+    # in dedup_by_book hashes/compares one shared string instead of many copies
+    title = sys.intern(strip_bom(lines[0]))
     meta = lines[1].strip()
     body_lines = lines[2:]
     # remove leading empty lines in body
@@ -153,6 +207,7 @@ def parse_entry(block: str, idx: int) -> Optional[Dict[str, Any]]:
     ts_raw = parse_timestamp(meta)
     ts_epoch = parse_timestamp_to_epoch(ts_raw)
     norm = normalize_for_compare(body)
+    clauses = split_clauses(norm)
     return {
         "idx": idx,
         "title": title,
@@ -163,8 +218,8 @@ def parse_entry(block: str, idx: int) -> Optional[Dict[str, Any]]:
         "timestamp": ts_epoch,
         "body": body,
         "norm": norm,
-        "hash": md5_utf8(norm),
-        "clauses": split_clauses(norm)
+        "clauses": clauses,
+        "clause_lens": tuple(len(c) for c in clauses)
     }
 
 def ranges_overlap(a, b, tol=8):
@@ -174,33 +229,66 @@ def ranges_overlap(a, b, tol=8):
         return False
     return not ((a2 + tol) < b1 or (b2 + tol) < a1)
 
+@functools.lru_cache(maxsize=4096)
+def _matcher_for(b: str) -> difflib.SequenceMatcher:
+    # SequenceMatcher caches its index of seq2; kept texts are compared against
+    # many candidates, so keep one matcher per b and only swap seq1
+    sm = difflib.SequenceMatcher(None)
+    sm.set_seq2(b)
+    return sm
+
+def _ratio(a: str, b: str, ratio: float) -> bool:
+    """True if difflib's ratio(a, b) >= ratio.
+    The length bound (real_quick_ratio) is checked before building anything and
+    quick_ratio() before the full matching, so pairs that cannot reach the
+    threshold are rejected early.
+    """
+    la, lb = len(a), len(b)
+    if 2.0 * min(la, lb) / (la + lb) < ratio:
+        return False
+    sm = _matcher_for(b)
+    sm.set_seq1(a)
+    return sm.quick_ratio() >= ratio and sm.ratio() >= ratio
+
 def very_close(a: str, b: str, ratio: float = 0.92) -> bool:
     if not a or not b:
         return False
     if min(len(a), len(b)) < 8:
         return a == b
-    return difflib.SequenceMatcher(None, a, b).ratio() >= ratio
+    return _ratio(a, b, ratio)
 
-def clause_based_match(a_clauses: List[str], b_clauses: List[str], min_len: int = 8, ratio: float = 0.90) -> bool:
+def clause_based_match(a_clauses: List[str], b_clauses: List[str], min_len: int = 8, ratio: float = 0.90,
+                       a_lens: Optional[Tuple[int, ...]] = None, b_lens: Optional[Tuple[int, ...]] = None) -> bool:
     # if any clause from a is subset of any clause in b (or vice versa) or very close -> match
-    for ca in a_clauses:
-        if len(ca) < min_len:
-            continue
-        for cb in b_clauses:
-            if len(cb) < min_len:
-                continue
+    # a_lens/b_lens are the precomputed len() of each clause (see parse_entry)
+    if a_lens is None:
+        a_lens = tuple(len(c) for c in a_clauses)
+    if b_lens is None:
+        b_lens = tuple(len(c) for c in b_clauses)
+    # apply the length gate once per clause instead of once per pair
+    long_a = [ca for ca, la in zip(a_clauses, a_lens) if la >= min_len]
+    if not long_a:
+        return False
+    long_b = [cb for cb, lb in zip(b_clauses, b_lens) if lb >= min_len]
+    # cheap substring tests on every pair first, SequenceMatcher only if all of them fail
+    for ca in long_a:
+        for cb in long_b:
             if ca in cb or cb in ca:
                 return True
-            if difflib.SequenceMatcher(None, ca, cb).ratio() >= ratio:
+    for ca in long_a:
+        for cb in long_b:
+            if _ratio(ca, cb, ratio):
                 return True
     return False
 
-def is_duplicate(cur, kept, time_tol=300, clause_min_len=12, debug=False):
+def is_duplicate(cur, kept, time_tol=300, clause_min_len=12, debug=False, use_loc=True, use_ts=True):
     """Enhanced duplicate detection using:
        - exact norm equality
        - location overlap
        - clause-based matching
        - timestamp proximity to be more permissive
+    use_loc/use_ts=False skip the overlap/timestamp tests when no entry of the
+    corpus has a location/timestamp (see dedup_by_book); the result is the same.
     """
     a, b = cur["norm"], kept["norm"]
     if not a or not b:
@@ -209,14 +297,17 @@ def is_duplicate(cur, kept, time_tol=300, clause_min_len=12, debug=False):
         if debug: print("dup exact equal")
         return True
 
-    overlap = ranges_overlap(cur["loc"], kept["loc"], tol=8)
+    overlap = use_loc and ranges_overlap(cur["loc"], kept["loc"], tol=8)
     # If timestamps exist and are close, be more permissive
-    ta, tb = cur.get("timestamp"), kept.get("timestamp")
-    time_close = (ta is not None and tb is not None and abs(ta - tb) <= time_tol)
+    time_close = False
+    if use_ts:
+        ta, tb = cur.get("timestamp"), kept.get("timestamp")
+        time_close = (ta is not None and tb is not None and abs(ta - tb) <= time_tol)
 
     # clause-level matching
     clause_match = clause_based_match(cur["clauses"], kept["clauses"], min_len=clause_min_len,
-                                      ratio=(0.88 if time_close else 0.92))
+                                      ratio=(0.88 if time_close else 0.92),
+                                      a_lens=cur.get("clause_lens"), b_lens=kept.get("clause_lens"))
     if overlap:
         if clause_match:
             if debug: print("dup overlap+clause")
@@ -234,7 +325,7 @@ def is_duplicate(cur, kept, time_tol=300, clause_min_len=12, debug=False):
         if clause_match:
             if debug: print("dup clause_match non-overlap")
             return True
-        if is_subset(a, b, min_len=(10 if time_close else 16)):
+        if is_subset(a, b, min_len=(10 if time_close else SUBSET_MIN_LEN)):
             if debug: print("dup subset non-overlap")
             return True
         if very_close(a, b, ratio=(0.95 if not time_close else 0.92)):
@@ -249,79 +340,184 @@ def is_subset(a: str, b: str, min_len: int = 12) -> bool:
         return False
     return a in b or b in a
 
+def new_kept_index() -> Dict[str, Any]:
+    """Lookup structures over the highlights kept so far for one book."""
+    return {
+        "entries": [],       # kept highlights, in insertion order
+        "norms": [],         # kept norms long enough for the subset fast path
+        "clauses": [],       # kept clauses of at least clause_min_len
+        "clause_set": set(), # the same clauses, for O(1) verbatim lookups
+        "text": None,        # cached ("\n".join(norms), "\n".join(clauses))
+    }
+
+def add_kept(index: Dict[str, Any], e: Dict[str, Any], clause_min_len: int = 12) -> None:
+    index["entries"].append(e)
+    if len(e["norm"]) >= SUBSET_MIN_LEN:
+        index["norms"].append(e["norm"])
+    for c, n in zip(e["clauses"], e["clause_lens"]):
+        if n >= clause_min_len:
+            index["clauses"].append(c)
+            index["clause_set"].add(c)
+    index["text"] = None
+
+def contained_in_kept(cur: Dict[str, Any], index: Dict[str, Any], clause_min_len: int = 12) -> bool:
+    """True if cur is certainly a duplicate by containment in some kept entry:
+    either its norm is a substring of a kept norm (is_subset at the strictest
+    length) or one of its clauses is a substring of a kept clause (clause_match).
+    Kept texts are joined with "\n", which never occurs in a norm, so one search
+    over the joined text replaces a scan over every kept entry. A clause kept
+    verbatim (re-highlighting) is found in the clause set before that search.
+    """
+    long_clauses = [c for c, n in zip(cur["clauses"], cur["clause_lens"]) if n >= clause_min_len]
+    if not index["clause_set"].isdisjoint(long_clauses):
+        return True
+    if index["text"] is None:
+        index["text"] = ("\n".join(index["norms"]), "\n".join(index["clauses"]))
+    norms_text, clauses_text = index["text"]
+    if len(cur["norm"]) >= SUBSET_MIN_LEN and cur["norm"] in norms_text:
+        return True
+    return any(c in clauses_text for c in long_clauses)
+
+def find_duplicate(cur, index, time_tol=300, clause_min_len=12, debug=False, use_loc=True, use_ts=True) -> bool:
+    """Return True if cur duplicates any entry kept in index (see new_kept_index).
+    Plain containment is answered from the index; only the remaining entries
+    go through the pairwise is_duplicate scan. Exact repeats never get here,
+    see _dedup_one_book.
+    """
+    if contained_in_kept(cur, index, clause_min_len=clause_min_len):
+        if debug: print("dup contained")
+        return True
+    return any(is_duplicate(cur, k, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug,
+                            use_loc=use_loc, use_ts=use_ts)
+               for k in index["entries"])
+
+def _dedup_one_book(item: Tuple[str, List[Dict[str, Any]]],
+                    time_tol: int = 300,
+                    clause_min_len: int = 12,
+                    debug: bool = False,
+                    use_loc: bool = True,
+                    use_ts: bool = True) -> Tuple[str, List[Dict[str, Any]], int]:
+    """Deduplicate the entries of one book; returns (book, kept, filtered_empty).
+    Top-level so it can be sent to worker processes.
+    """
+    book, es = item
+    stats_filtered_empty = 0
+    # preserve original order but we prefer latest entries:
+    # sort by idx ascending (original order), but we'll iterate reversed to keep later ones
+    kept_n, kept_b = [], []
+    kept_index = new_kept_index()
+    # exact-text lookups: one set probe instead of a scan over the kept list
+    seen_notes, seen_bookmarks, seen_norms = set(), set(), set()
+    for cur in reversed(es):
+        # filter empty bodies (no body and no meta useful)
+        if not cur["body"] or not cur["body"].strip():
+            # treat empty mark as noise; skip it
+            stats_filtered_empty += 1
+            if debug:
+                print("Filtered empty:", cur["title"], cur["meta"])
+            continue
+        t = cur["type"]
+        if t == "note":
+            if cur["norm"] not in seen_notes:
+                seen_notes.add(cur["norm"])
+                kept_n.append(cur)
+        elif t == "bookmark":
+            if cur["meta"] not in seen_bookmarks:
+                seen_bookmarks.add(cur["meta"])
+                kept_b.append(cur)
+        else:
+            # exact repeats are settled in this single pass, like notes: the latest
+            # copy stands for all of them, so only distinct texts reach the
+            # fuzzy check below
+            if cur["norm"]:
+                if cur["norm"] in seen_norms:
+                    if debug: print("dup exact equal")
+                    continue
+                seen_norms.add(cur["norm"])
+            # highlights and unknown types share the fuzzy duplicate check
+            dup = find_duplicate(cur, kept_index, time_tol=time_tol, clause_min_len=clause_min_len,
+                                 debug=debug, use_loc=use_loc, use_ts=use_ts)
+            if not dup:
+                add_kept(kept_index, cur, clause_min_len=clause_min_len)
+
+    def sort_key(x):
+        s, e2 = x["loc"]
+        if s is None:
+            # if no location, sort by timestamp (newer first)
+            ts = x.get("timestamp") or 0
+            return (10**12, -ts, x["idx"])
+        return (s, x["idx"])
+
+    kept_h = kept_index["entries"]
+    kept_h.sort(key=sort_key)
+    kept_n.sort(key=sort_key)
+    kept_b.sort(key=sort_key)
+    return book, kept_h + kept_n + kept_b, stats_filtered_empty
+
 def dedup_by_book(entries: List[Dict[str, Any]],
                   time_tol: int = 300,
                   clause_min_len: int = 12,
-                  debug: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+                  debug: bool = False,
+                  workers: Optional[int] = 1) -> Dict[str, List[Dict[str, Any]]]:
+    """Group entries by book title and drop duplicates within each book.
+    Books are independent, so with workers > 1 (None: one per CPU) they are
+    deduplicated in a process pool; if no pool can be started, serially.
+    """
     by_book = defaultdict(list)
     for e in entries:
         by_book[e["title"]].append(e)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # older Kindles write no timestamps, some exports no locations: decide once
+    # for the whole run instead of re-testing None on every comparison
+    use_loc = any(e["loc"][0] is not None for e in entries)
+    use_ts = any(e.get("timestamp") is not None for e in entries)
+    one_book = functools.partial(_dedup_one_book, time_tol=time_tol, clause_min_len=clause_min_len,
+                                 debug=debug, use_loc=use_loc, use_ts=use_ts)
+    workers = min(workers, len(by_book))
+    if MAX_WORKERS is not None:
+        workers = min(workers, MAX_WORKERS)
+    done = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                done = list(executor.map(one_book, by_book.items(), chunksize=4))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            # e.g. no working multiprocessing in this environment
+            if debug:
+                print("Process pool unavailable, dedup serially:", e)
+    if done is None:
+        done = [one_book(item) for item in by_book.items()]
     result = {}
     stats_filtered_empty = 0
-    for book, es in by_book.items():
-        # preserve original order but we prefer latest entries:
-        # sort by idx ascending (original order), but we'll iterate reversed to keep later ones
-        kept_h, kept_n, kept_b = [], [], []
-        for cur in reversed(es):
-            # filter empty bodies (no body and no meta useful)
-            if not cur["body"] or not cur["body"].strip():
-                # treat empty mark as noise; skip it
-                stats_filtered_empty += 1
-                if debug:
-                    print("Filtered empty:", cur["title"], cur["meta"])
-                continue
-            t = cur["type"]
-            if t == "highlight":
-                dup = any(is_duplicate(cur, k, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug) for k in kept_h)
-                if not dup:
-                    kept_h.append(cur)
-            elif t == "note":
-                if not any(cur["norm"] == k["norm"] for k in kept_n):
-                    kept_n.append(cur)
-            elif t == "bookmark":
-                if not any(cur["meta"] == k["meta"] for k in kept_b):
-                    kept_b.append(cur)
-            else:
-                dup = any(is_duplicate(cur, k, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug) for k in kept_h)
-                if not dup:
-                    kept_h.append(cur)
-
-        def sort_key(x):
-            s, e2 = x["loc"]
-            if s is None:
-                # if no location, sort by timestamp (newer first)
-                ts = x.get("timestamp") or 0
-                return (10**12, -ts, x["idx"])
-            return (s, x["idx"])
-
-        kept_h.sort(key=sort_key)
-        kept_n.sort(key=sort_key)
-        kept_b.sort(key=sort_key)
-        result[book] = kept_h + kept_n + kept_b
+    for book, kept, filtered in done:
+        result[book] = kept
+        stats_filtered_empty += filtered
     if debug:
         print("Filtered empty markers:", stats_filtered_empty)
     return result
 
 def save_md(by_book: Dict[str, List[Dict[str, Any]]], out_path: str) -> None:
-    with open(out_path, "w", encoding="utf-8-sig") as f:
+    # one write per book through a large buffer instead of one per line
+    with open(out_path, "w", encoding="utf-8-sig", buffering=1 << 20) as f:
         for book, items in by_book.items():
-            f.write(f"## {book}\n\n")
+            parts = [f"## {book}\n\n"]
             for it in items:
                 if it["body"]:
-                    f.write(f"{it['body']}\n\n")
+                    parts.append(f"{it['body']}\n\n")
                 else:
-                    f.write(f"（{it['type']}） {it['meta']}\n\n")
+                    parts.append(f"（{it['type']}） {it['meta']}\n\n")
+            f.write("".join(parts))
 
-def main(in_path: str, out_md: str, time_tol: int = 300, clause_min_len: int = 12, debug: bool = False) -> None:
-    with open(in_path, "r", encoding="utf-8", errors='ignore') as fp:
-        content = fp.read()
-    blocks = split_entries(content)
+def main(in_path: str, out_md: str, time_tol: int = 300, clause_min_len: int = 12, debug: bool = False,
+         workers: Optional[int] = None) -> None:
     parsed = []
-    for i, blk in enumerate(blocks):
+    for i, blk in enumerate(iter_entries(in_path)):
         e = parse_entry(blk, idx=i)
         if e:
             parsed.append(e)
-    by_book = dedup_by_book(parsed, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug)
+    by_book = dedup_by_book(parsed, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug,
+                            workers=workers)
     save_md(by_book, out_md)
     print(f"去重完成，共 {len(by_book)} 本书。已保存 -> {out_md}")
 
@@ -335,14 +531,16 @@ if __name__ == "__main__":
         out_md = sys.argv[2] if len(sys.argv) >= 3 else "Clipping_cleaned.md"
 
     # optional environment params via sys.argv? simple: read extra args if present
-    # usage: python clipping_cleaner_v2.py in.txt out.md time_tol clause_min_len debug
+    # usage: python clipping_cleaner_v2.py in.txt out.md time_tol clause_min_len debug workers
     try:
         time_tol = int(sys.argv[3]) if len(sys.argv) >= 4 else 300
         clause_min_len = int(sys.argv[4]) if len(sys.argv) >= 5 else 12
         debug = bool(int(sys.argv[5])) if len(sys.argv) >= 6 else False
+        workers = int(sys.argv[6]) if len(sys.argv) >= 7 else None
     except Exception:
         time_tol = 300
         clause_min_len = 12
         debug = False
+        workers = None
 
-    main(in_file, out_md, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug)
+    main(in_file, out_md, time_tol=time_tol, clause_min_len=clause_min_len, debug=debug, workers=workers)